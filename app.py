@@ -4,6 +4,7 @@ Transforms research papers into investor-ready pitch decks using a sequential mu
 """
 
 import streamlit as st
+import io
 import json
 import time
 import logging
@@ -464,14 +465,13 @@ def step3_insights_review():
         if st.button("📥 Download Full Pitch Deck (PDF)", type="primary"):
             with st.spinner("Generating PDF..."):
                 try:
-                    pdf_path = create_pitch_deck(all_outputs)
-                    with open(pdf_path, "rb") as pdf_file:
-                        st.download_button(
-                            label="Download PDF",
-                            data=pdf_file.read(),
-                            file_name="pitch_deck.pdf",
-                            mime="application/pdf"
-                        )
+                    pdf_buffer = create_pitch_deck(all_outputs, io.BytesIO())
+                    st.download_button(
+                        label="Download PDF",
+                        data=pdf_buffer.getvalue(),
+                        file_name="pitch_deck.pdf",
+                        mime="application/pdf"
+                    )
                     st.success("✅ Pitch deck generated successfully!")
                 except Exception as e:
                     st.error(f"Error generating PDF: {str(e)}")
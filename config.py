@@ -19,6 +19,7 @@ MAX_TEXT_LENGTH = 10000  # maximum text length for processing
 
 # PDF Settings
 MAX_PDF_PAGES = 50  # maximum pages to process from PDF
+MAX_PDF_CHARS = 200000  # stop extracting once this much text is collected
 
 # Output Settings
 DEFAULT_OUTPUT_DIR = "output"
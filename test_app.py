@@ -104,6 +104,20 @@ def test_utilities():
         matches = find_investor_matches(project_attributes)
         print(f"   Investor matching: {'✅' if matches else '❌'}")
         
+        # Test that vectorized and per-investor scoring stay in sync
+        from utils.matcher import _investor_matrix, calculate_match_score, load_investors
+        sample_projects = [
+            project_attributes,
+            {'application_domains': ['Climate'], 'readiness_level': 2, 'funding_needs': 5000000, 'geo': 'India'},
+            {'application_domains': [], 'readiness_level': 8},
+            {}
+        ]
+        for attributes in sample_projects:
+            vectorized = _investor_matrix().score(attributes).tolist()
+            scalar = [calculate_match_score(attributes, inv) for inv in load_investors()]
+            assert vectorized == scalar, f"matcher scores diverge for {attributes}"
+        print("   Matcher scoring parity: ✅")
+        
         # Test team recommendations
         team_roles = get_team_recommendations(project_attributes)
         print(f"   Team recommendations: {'✅' if team_roles else '❌'}")
@@ -112,6 +126,18 @@ def test_utilities():
         gemini_response = call_gemini("Test prompt for Gemini")
         print(f"   Gemini client: {'✅' if gemini_response else '❌'}")
         
+        # Test that a response truncated mid-object falls back instead of
+        # returning one of its nested objects
+        from utils.gemini_client import _extract_json
+        truncated = '```json\n{"slides": [{"title": "Problem & Opportunity", "content": "x"}, {"title": "Core Innov'
+        try:
+            _extract_json(truncated)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("truncated JSON response was not rejected")
+        print("   Truncated JSON rejected: ✅")
+        
         print("✅ All utilities tested successfully!")
         return True
         
@@ -3,192 +3,298 @@ Pitch deck generation utilities for the Research-to-Startup AI Agent Swarm.
 """
 
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+from reportlab.platypus import BaseDocTemplate, Flowable, Frame, PageTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 from reportlab.lib import colors
 import io
-from typing import Dict, List, Any
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List, Any, BinaryIO, Iterator, Optional, Tuple, Union
+from xml.sax.saxutils import escape
 
-def create_pitch_deck(agent_outputs: Dict[str, Any], output_path: str = "pitch_deck.pdf") -> str:
+# Maximum number of team roles listed in the text summary
+MAX_SUMMARY_TEAM_ROLES = 20
+
+# Stylesheet and custom styles are immutable once defined, so build them once
+# per process instead of on every deck generation.
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    textColor=colors.darkblue,
+    alignment=1  # Center alignment
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=18,
+    spaceAfter=12,
+    textColor=colors.darkblue
+)
+
+_BODY_STYLE = ParagraphStyle(
+    'CustomBody',
+    parent=_STYLES['Normal'],
+    fontSize=12,
+    spaceAfter=12,
+    leftIndent=20
+)
+
+@dataclass(slots=True)
+class Section:
+    """A block of slide content: an optional lead-in line followed by text or list items."""
+    kind: str  # "text", "bullets" or "numbered"
+    label: str = ""
+    text: str = ""
+    items: List[str] = field(default_factory=list)
+
+@dataclass(slots=True)
+class SlideSpec:
+    """Declarative description of a single pitch deck slide."""
+    title: str
+    sections: List[Section]
+
+@dataclass(slots=True, frozen=True)
+class DeckContext:
+    """Agent fields used by the deck, extracted once per generation."""
+    innovations: List[str]
+    domains: List[str]
+    trl: int
+    tam: str
+    sam: str
+    som: str
+    trends: List[str]
+    competitors: List[str]
+    roadmap: List[str]
+    resources: Dict[str, Any]
+    risks: List[str]
+    team: List[str]
+    investors: List[Dict[str, Any]]
+
+def _deck_context(agent_outputs: Dict[str, Any]) -> DeckContext:
     """
-    Generate a PDF pitch deck from agent outputs.
+    Pull every agent field the deck uses out of agent_outputs in one pass.
+    
+    Missing or None list fields are normalized to empty lists so callers can
+    use the attributes directly.
     
     Args:
         agent_outputs: Dictionary containing outputs from all agents
-        output_path: Path to save the PDF file
     
     Returns:
-        Path to the generated PDF file
+        DeckContext with one attribute per extracted field
     """
-    doc = SimpleDocTemplate(output_path, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        textColor=colors.darkblue,
-        alignment=1  # Center alignment
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=18,
-        spaceAfter=12,
-        textColor=colors.darkblue
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=12,
-        leftIndent=20
+    research_data = agent_outputs.get('research_agent') or {}
+    market_data = agent_outputs.get('market_agent') or {}
+    feasibility_data = agent_outputs.get('feasibility_agent') or {}
+    stakeholder_data = agent_outputs.get('stakeholder_agent') or {}
+    
+    return DeckContext(
+        innovations=research_data.get('innovations') or [],
+        domains=research_data.get('application_domains') or [],
+        trl=research_data.get('readiness_level', 0),
+        tam=market_data.get('TAM', 'N/A'),
+        sam=market_data.get('SAM', 'N/A'),
+        som=market_data.get('SOM', 'N/A'),
+        trends=market_data.get('trends') or [],
+        competitors=market_data.get('competitors') or [],
+        roadmap=feasibility_data.get('roadmap') or [],
+        resources=feasibility_data.get('resources') or {},
+        risks=feasibility_data.get('risks') or [],
+        team=stakeholder_data.get('team_roles') or [],
+        investors=stakeholder_data.get('investor_matches') or [],
     )
+
+def _escape_all(items: List[Any]) -> List[str]:
+    """XML-escape agent-supplied values for use in Paragraph markup."""
+    return [escape(str(item)) for item in items]
+
+def _build_slides(ctx: DeckContext) -> List[SlideSpec]:
+    """
+    Describe the content slides of the pitch deck.
     
-    # Title slide
-    story.append(Paragraph("Research-to-Startup Pitch Deck", title_style))
-    story.append(Spacer(1, 20))
-    story.append(Paragraph("Transforming Research into Investment Opportunities", body_style))
-    story.append(PageBreak())
-    
-    # Extract data from agent outputs
-    research_data = agent_outputs.get('research_agent', {})
-    market_data = agent_outputs.get('market_agent', {})
-    feasibility_data = agent_outputs.get('feasibility_agent', {})
-    stakeholder_data = agent_outputs.get('stakeholder_agent', {})
-    business_plan_data = agent_outputs.get('business_plan_agent', {})
-    
-    # Slide 1: Problem & Opportunity
-    story.append(Paragraph("1. Problem & Opportunity", heading_style))
-    story.append(Spacer(1, 10))
-    
-    innovations = research_data.get('innovations', [])
-    if innovations:
-        story.append(Paragraph("Key Innovations:", body_style))
-        for innovation in innovations[:3]:  # Top 3 innovations
-            story.append(Paragraph(f"• {innovation}", body_style))
-    
-    application_domains = research_data.get('application_domains', [])
-    if application_domains:
-        story.append(Paragraph(f"Target Domains: {', '.join(application_domains)}", body_style))
-    
-    story.append(PageBreak())
-    
-    # Slide 2: Core Innovation
-    story.append(Paragraph("2. Core Innovation", heading_style))
-    story.append(Spacer(1, 10))
-    
-    readiness_level = research_data.get('readiness_level', 0)
-    story.append(Paragraph(f"Technology Readiness Level: {readiness_level}/9", body_style))
+    Sections without text or items are skipped at render time, so optional
+    agent fields simply produce empty sections here. Agent-supplied text is
+    escaped once here, so every Section string is safe Paragraph markup.
     
-    if innovations:
-        story.append(Paragraph("Primary Innovation:", body_style))
-        story.append(Paragraph(innovations[0], body_style))
+    Args:
+        ctx: Extracted agent fields from _deck_context
     
-    story.append(PageBreak())
+    Returns:
+        Ordered list of slide specifications
+    """
+    innovations = _escape_all(ctx.innovations[:3])  # Top 3 innovations
+    domains = _escape_all(ctx.domains)
+    trl, tam, sam, som = _escape_all([ctx.trl, ctx.tam, ctx.sam, ctx.som])
+    resources = ctx.resources
     
-    # Slide 3: Market Landscape
-    story.append(Paragraph("3. Market Landscape", heading_style))
-    story.append(Spacer(1, 10))
+    resource_items = []
+    if resources:
+        resource_items = _escape_all([
+            f"Time: {resources.get('time', 'N/A')}",
+            f"Team Size: {resources.get('team_size', 'N/A')}",
+            f"Budget: {resources.get('budget', 'N/A')}",
+        ])
+    
+    investor_items = [
+        "%s (%.0f%% match) - %s stage, %s" % (
+            escape(str(investor.get('name', 'Unknown'))),
+            investor.get('match_score', 0) * 100,
+            escape(str(investor.get('stage', 'Unknown'))),
+            escape(str(investor.get('ticket_size', 'Unknown'))),
+        )
+        for investor in ctx.investors[:3]
+    ]
+    
+    return [
+        SlideSpec("1. Problem & Opportunity", [
+            Section("bullets", label="Key Innovations:", items=innovations),
+            Section("text", text=f"Target Domains: {', '.join(domains)}" if domains else ""),
+        ]),
+        SlideSpec("2. Core Innovation", [
+            Section("text", text=f"Technology Readiness Level: {trl}/9"),
+            Section("text", label="Primary Innovation:", text=innovations[0] if innovations else ""),
+        ]),
+        SlideSpec("3. Market Landscape", [
+            Section("text", text=f"Total Addressable Market (TAM): {tam}"),
+            Section("text", text=f"Serviceable Addressable Market (SAM): {sam}"),
+            Section("text", text=f"Serviceable Obtainable Market (SOM): {som}"),
+            Section("bullets", label="Market Trends:", items=_escape_all(ctx.trends[:3])),
+        ]),
+        SlideSpec("4. Competitive Advantage", [
+            Section("bullets", label="Key Competitors:", items=_escape_all(ctx.competitors[:3])),
+            Section("bullets", label="Our Differentiators:", items=[
+                "Novel research-based approach",
+                "Strong technical foundation",
+                "Clear market opportunity",
+            ]),
+        ]),
+        SlideSpec("5. Feasibility & Roadmap", [
+            Section("numbered", label="Development Roadmap:", items=_escape_all(ctx.roadmap)),
+            Section("bullets", label="Resource Requirements:", items=resource_items),
+        ]),
+        SlideSpec("6. Business Potential", [
+            Section("bullets", label="Market Opportunity:", items=[
+                f"Large addressable market ({tam})",
+                "Growing market trends",
+                "Clear monetization path",
+            ]),
+            Section("bullets", label="Key Risks:", items=_escape_all(ctx.risks[:3])),
+        ]),
+        SlideSpec("7. Next Steps & Investor Recommendations", [
+            Section("bullets", label="Immediate Next Steps:", items=[
+                "Finalize technical prototype",
+                "Conduct market validation",
+                "Build founding team",
+                "Secure initial funding",
+            ]),
+            Section("numbered", label="Recommended Investors:", items=investor_items),
+        ]),
+    ]
+
+def _bullets_paragraph(items: List[str], style: ParagraphStyle) -> Paragraph:
+    """Render already-escaped items as one bulleted Paragraph with line breaks."""
+    return Paragraph("<br/>".join(f"• {item}" for item in items), style)
+
+def _numbered_paragraph(items: List[str], style: ParagraphStyle) -> Paragraph:
+    """Render already-escaped items as one numbered Paragraph with line breaks."""
+    return Paragraph("<br/>".join(f"{i}. {item}" for i, item in enumerate(items, 1)), style)
+
+# Section kind -> function building that section's body flowable
+_SECTION_RENDERERS = {
+    "text": lambda section, style: Paragraph(section.text, style),
+    "bullets": lambda section, style: _bullets_paragraph(section.items, style),
+    "numbered": lambda section, style: _numbered_paragraph(section.items, style),
+}
+
+def _render_slide(spec: SlideSpec) -> Iterator[Flowable]:
+    """Yield the flowables for one content slide."""
+    renderers = _SECTION_RENDERERS
+    body_style = _BODY_STYLE
+    
+    yield PageBreak()
+    yield Paragraph(spec.title, _HEADING_STYLE)
+    yield Spacer(1, 10)
+    
+    for section in spec.sections:
+        if not (section.text or section.items):
+            continue
+        if section.label:
+            yield Paragraph(section.label, body_style)
+        yield renderers[section.kind](section, body_style)
+
+def iter_slides(agent_outputs: Dict[str, Any]) -> Iterator[Flowable]:
+    """
+    Yield the flowables of the whole pitch deck, title slide first.
     
-    tam = market_data.get('TAM', 'N/A')
-    sam = market_data.get('SAM', 'N/A')
-    som = market_data.get('SOM', 'N/A')
+    Args:
+        agent_outputs: Dictionary containing outputs from all agents
     
-    story.append(Paragraph(f"Total Addressable Market (TAM): {tam}", body_style))
-    story.append(Paragraph(f"Serviceable Addressable Market (SAM): {sam}", body_style))
-    story.append(Paragraph(f"Serviceable Obtainable Market (SOM): {som}", body_style))
+    Returns:
+        Iterator over the deck's flowables in document order
+    """
+    yield Paragraph("Research-to-Startup Pitch Deck", _TITLE_STYLE)
+    yield Spacer(1, 20)
+    yield Paragraph("Transforming Research into Investment Opportunities", _BODY_STYLE)
     
-    trends = market_data.get('trends', [])
-    if trends:
-        story.append(Paragraph("Market Trends:", body_style))
-        for trend in trends[:3]:
-            story.append(Paragraph(f"• {trend}", body_style))
+    for spec in _build_slides(_deck_context(agent_outputs)):
+        yield from _render_slide(spec)
+
+def create_pitch_deck(agent_outputs: Dict[str, Any], output_path: Union[str, BinaryIO] = "pitch_deck.pdf") -> Union[str, BinaryIO]:
+    """
+    Generate a PDF pitch deck from agent outputs.
     
-    story.append(PageBreak())
+    ReportLab assembles the whole document in memory and writes it out in a
+    single call, so passing a binary file object (e.g. io.BytesIO) avoids
+    the round trip through disk when the caller only needs the bytes.
     
-    # Slide 4: Competitive Advantage
-    story.append(Paragraph("4. Competitive Advantage", heading_style))
-    story.append(Spacer(1, 10))
+    Args:
+        agent_outputs: Dictionary containing outputs from all agents
+        output_path: Path or writable binary file object for the PDF
     
-    competitors = market_data.get('competitors', [])
-    if competitors:
-        story.append(Paragraph("Key Competitors:", body_style))
-        for competitor in competitors[:3]:
-            story.append(Paragraph(f"• {competitor}", body_style))
+    Returns:
+        The output_path the PDF was written to
+    """
+    doc = BaseDocTemplate(output_path, pagesize=letter)
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+    doc.addPageTemplates([PageTemplate(id='Slide', frames=[frame], pagesize=letter)])
     
-    story.append(Paragraph("Our Differentiators:", body_style))
-    story.append(Paragraph("• Novel research-based approach", body_style))
-    story.append(Paragraph("• Strong technical foundation", body_style))
-    story.append(Paragraph("• Clear market opportunity", body_style))
+    # build() pops flowables off the list as they are laid out, so each one
+    # can be freed once its page is drawn
+    doc.build(list(iter_slides(agent_outputs)))
+    return output_path
+
+def _create_pitch_deck_job(job: Tuple[Dict[str, Any], str]) -> str:
+    """Unpack a (agent_outputs, output_path) pair for process pool workers."""
+    agent_outputs, output_path = job
+    return create_pitch_deck(agent_outputs, output_path)
+
+def create_pitch_decks_batch(jobs: List[Tuple[Dict[str, Any], str]], workers: Optional[int] = None) -> List[str]:
+    """
+    Generate several pitch decks in parallel worker processes.
     
-    story.append(PageBreak())
+    ReportLab layout is pure Python and holds the GIL, so decks are spread
+    across processes rather than threads. Each worker builds the module-level
+    styles once on import and reuses them for every deck it renders.
     
-    # Slide 5: Feasibility & Roadmap
-    story.append(Paragraph("5. Feasibility & Roadmap", heading_style))
-    story.append(Spacer(1, 10))
+    Args:
+        jobs: List of (agent_outputs, output_path) pairs; outputs must be file paths
+        workers: Number of worker processes (defaults to the CPU count)
     
-    roadmap = feasibility_data.get('roadmap', [])
-    if roadmap:
-        story.append(Paragraph("Development Roadmap:", body_style))
-        for i, milestone in enumerate(roadmap, 1):
-            story.append(Paragraph(f"{i}. {milestone}", body_style))
+    Returns:
+        Paths of the generated PDF files, in the same order as jobs
+    """
+    if not jobs:
+        return []
     
-    resources = feasibility_data.get('resources', {})
-    if resources:
-        story.append(Paragraph(f"Resource Requirements:", body_style))
-        story.append(Paragraph(f"• Time: {resources.get('time', 'N/A')}", body_style))
-        story.append(Paragraph(f"• Team Size: {resources.get('team_size', 'N/A')}", body_style))
-        story.append(Paragraph(f"• Budget: {resources.get('budget', 'N/A')}", body_style))
-    
-    story.append(PageBreak())
-    
-    # Slide 6: Business Potential
-    story.append(Paragraph("6. Business Potential", heading_style))
-    story.append(Spacer(1, 10))
-    
-    story.append(Paragraph("Market Opportunity:", body_style))
-    story.append(Paragraph(f"• Large addressable market ({tam})", body_style))
-    story.append(Paragraph(f"• Growing market trends", body_style))
-    story.append(Paragraph(f"• Clear monetization path", body_style))
-    
-    risks = feasibility_data.get('risks', [])
-    if risks:
-        story.append(Paragraph("Key Risks:", body_style))
-        for risk in risks[:3]:
-            story.append(Paragraph(f"• {risk}", body_style))
-    
-    story.append(PageBreak())
-    
-    # Slide 7: Next Steps & Investor Recommendations
-    story.append(Paragraph("7. Next Steps & Investor Recommendations", heading_style))
-    story.append(Spacer(1, 10))
-    
-    story.append(Paragraph("Immediate Next Steps:", body_style))
-    story.append(Paragraph("• Finalize technical prototype", body_style))
-    story.append(Paragraph("• Conduct market validation", body_style))
-    story.append(Paragraph("• Build founding team", body_style))
-    story.append(Paragraph("• Secure initial funding", body_style))
-    
-    investor_matches = stakeholder_data.get('investor_matches', [])
-    if investor_matches:
-        story.append(Paragraph("Recommended Investors:", body_style))
-        for i, investor in enumerate(investor_matches[:3], 1):
-            name = investor.get('name', 'Unknown')
-            score = investor.get('match_score', 0)
-            stage = investor.get('stage', 'Unknown')
-            ticket = investor.get('ticket_size', 'Unknown')
-            story.append(Paragraph(f"{i}. {name} ({score*100:.0f}% match) - {stage} stage, {ticket}", body_style))
-    
-    # Build PDF
-    doc.build(story)
-    return output_path
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return list(executor.map(_create_pitch_deck_job, jobs))
 
 def generate_deck_summary(agent_outputs: Dict[str, Any]) -> str:
     """
@@ -200,30 +306,26 @@ def generate_deck_summary(agent_outputs: Dict[str, Any]) -> str:
     Returns:
         Text summary of the pitch deck
     """
-    research_data = agent_outputs.get('research_agent', {})
-    market_data = agent_outputs.get('market_agent', {})
-    stakeholder_data = agent_outputs.get('stakeholder_agent', {})
+    ctx = _deck_context(agent_outputs)
     
-    summary = "## Pitch Deck Summary\n\n"
+    buf = io.StringIO()
+    write = buf.write
+    write("## Pitch Deck Summary\n\n")
     
     # Key innovations
-    innovations = research_data.get('innovations', [])
-    if innovations:
-        summary += f"**Key Innovation:** {innovations[0]}\n\n"
+    if ctx.innovations:
+        write(f"**Key Innovation:** {ctx.innovations[0]}\n\n")
     
     # Market size
-    tam = market_data.get('TAM', 'N/A')
-    summary += f"**Market Size:** {tam}\n\n"
+    write(f"**Market Size:** {ctx.tam}\n\n")
     
     # Top investor match
-    investor_matches = stakeholder_data.get('investor_matches', [])
-    if investor_matches:
-        top_investor = investor_matches[0]
-        summary += f"**Top Investor Match:** {top_investor.get('name', 'Unknown')} ({top_investor.get('match_score', 0)*100:.0f}% match)\n\n"
+    if ctx.investors:
+        top_investor = ctx.investors[0]
+        write(f"**Top Investor Match:** {top_investor.get('name', 'Unknown')} ({top_investor.get('match_score', 0)*100:.0f}% match)\n\n")
     
-    # Team recommendations
-    team_roles = stakeholder_data.get('team_roles', [])
-    if team_roles:
-        summary += f"**Recommended Team:** {', '.join(team_roles)}\n\n"
+    # Team recommendations (capped so very long role lists don't bloat the preview)
+    if ctx.team:
+        write(f"**Recommended Team:** {', '.join(islice(ctx.team, MAX_SUMMARY_TEAM_ROLES))}\n\n")
     
-    return summary
+    return buf.getvalue()
@@ -3,17 +3,23 @@ Gemini AI client for the Research-to-Startup AI Agent Swarm.
 Handles all interactions with Google's Gemini API with comprehensive logging.
 """
 
-import google.generativeai as genai
 import json
+import re
 from dotenv import load_dotenv
 import os
+import sys
+import threading
 
 load_dotenv()
 import logging
-from typing import Dict, Any, List
-import streamlit as st
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+# google.generativeai takes ~0.4s to import and demo mode never needs it,
+# so it is imported on first real use
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,6 +27,46 @@ logger = logging.getLogger(__name__)
 # Global variable to track if we're in demo mode
 DEMO_MODE = False
 
+# GenerativeModel instances keyed by "models/..." name, shared by every
+# call; cleared whenever genai is reconfigured, since a model keeps the
+# credentials it first called with
+_MODEL_CACHE: Dict[str, 'genai.GenerativeModel'] = {}
+
+# Successful Gemini responses keyed by (model_name, prompt), oldest first
+RESPONSE_CACHE_SIZE = 512
+_RESPONSE_CACHE: Dict[Tuple[str, str], str] = {}
+# Streamlit serves each session on its own thread
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+def _get_model(model_name: str) -> 'genai.GenerativeModel':
+    """Return the cached GenerativeModel for model_name, creating it on first use."""
+    # 'gemini-1.5-flash' and 'models/gemini-1.5-flash' are the same model
+    if not model_name.startswith('models/'):
+        model_name = f'models/{model_name}'
+    model = _MODEL_CACHE.get(model_name)
+    if model is None:
+        import google.generativeai as genai
+        model = _MODEL_CACHE[model_name] = genai.GenerativeModel(model_name)
+    return model
+
+def _notify_streamlit(level: str, message: str) -> None:
+    """
+    Show a message in the Streamlit UI when running inside a Streamlit app.
+    
+    Scripts and workers that only call the Gemini helpers never load
+    Streamlit, so they skip both its import cost and its missing-context
+    warnings.
+    """
+    if 'streamlit' not in sys.modules:
+        return
+    
+    from streamlit.runtime import exists
+    if not exists():
+        return
+    
+    import streamlit as st
+    getattr(st, level)(message)
+
 def initialize_gemini():
     """Initialize Gemini client with API key."""
     global DEMO_MODE
@@ -29,25 +75,46 @@ def initialize_gemini():
     if not api_key or api_key == 'demo-key-placeholder':
         DEMO_MODE = True
         logger.warning("⚠️ Running in DEMO MODE - No valid API key found")
-        st.warning("⚠️ Using demo mode. Set GEMINI_API_KEY environment variable for real Gemini API access.")
+        _notify_streamlit("warning", "⚠️ Using demo mode. Set GEMINI_API_KEY environment variable for real Gemini API access.")
         return None
     
     try:
+        import google.generativeai as genai
         genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('models/gemini-1.5-flash')
+        _MODEL_CACHE.clear()
+        model = _get_model('models/gemini-1.5-flash')
         logger.info("✅ Gemini API initialized successfully")
         DEMO_MODE = False
         return model
     except Exception as e:
-        logger.error(f"❌ Failed to initialize Gemini: {str(e)}")
+        logger.error("❌ Failed to initialize Gemini: %s", e)
         DEMO_MODE = True
-        st.error(f"❌ Gemini initialization failed: {str(e)}")
+        _notify_streamlit("error", f"❌ Gemini initialization failed: {str(e)}")
         return None
 
+def _cache_response(key: Tuple[str, str], text: str) -> None:
+    """Store a Gemini response, evicting the least recently used entry when full."""
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE.pop(key, None)
+        if len(_RESPONSE_CACHE) >= RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)), None)
+        _RESPONSE_CACHE[key] = text
+
+def _cached_response(key: Tuple[str, str]) -> Optional[str]:
+    """Return a cached Gemini response, marking it most recently used, or None."""
+    with _RESPONSE_CACHE_LOCK:
+        cached = _RESPONSE_CACHE.pop(key, None)
+        if cached is not None:
+            _RESPONSE_CACHE[key] = cached
+        return cached
+
 def call_gemini(prompt: str, model_name: str = 'gemini-1.5-flash') -> str:
     """
     Call Gemini API with a prompt and return the response.
     
+    Successful responses are cached per (model_name, prompt), so re-running
+    the pipeline on the same paper does not repeat the network round trips.
+    
     Args:
         prompt: The input prompt for the model
         model_name: The Gemini model to use (default: gemini-1.5-flash)
@@ -58,137 +125,191 @@ def call_gemini(prompt: str, model_name: str = 'gemini-1.5-flash') -> str:
     global DEMO_MODE
     
     # Log the API call
-    logger.info(f"🤖 Gemini API Call - Model: {model_name}")
-    logger.info(f"📝 Prompt: {prompt[:200]}...")
+    log_previews = logger.isEnabledFor(logging.INFO)
+    logger.info("🤖 Gemini API Call - Model: %s", model_name)
+    if log_previews:
+        logger.info("📝 Prompt: %s...", prompt[:200])
     
     if DEMO_MODE:
         logger.warning("⚠️ DEMO MODE - Returning mock response")
         mock_response = generate_mock_response(prompt)
-        logger.info(f"📤 Mock Response: {mock_response[:200]}...")
+        if log_previews:
+            logger.info("📤 Mock Response: %s...", mock_response[:200])
         return mock_response
     
+    cache_key = (model_name, prompt)
+    cached = _cached_response(cache_key)
+    if cached is not None:
+        logger.info("♻️ Returning cached Gemini response")
+        return cached
+    
     try:
-        model = genai.GenerativeModel(model_name)
+        model = _get_model(model_name)
         response = model.generate_content(prompt)
-        
-        if response.text:
-            logger.info(f"✅ Gemini API Response received")
-            logger.info(f"📤 Response: {response.text[:200]}...")
-            return response.text
-        else:
-            logger.warning("⚠️ Empty response from Gemini API")
-            return generate_mock_response(prompt)
-            
+        response_text = response.text
     except Exception as e:
-        logger.error(f"❌ Gemini API Error: {str(e)}")
+        logger.error("❌ Gemini API Error: %s", e)
         logger.warning("⚠️ Falling back to mock response")
         return generate_mock_response(prompt)
+    
+    if not response_text:
+        logger.warning("⚠️ Empty response from Gemini API")
+        return generate_mock_response(prompt)
+    
+    logger.info("✅ Gemini API Response received")
+    if log_previews:
+        logger.info("📤 Response: %s...", response_text[:200])
+    # Cached outside the try so a cache problem can never replace a real answer
+    _cache_response(cache_key, response_text)
+    return response_text
+
+# Mock payloads are static, so serialize them once at import
+_MOCK_RESEARCH_JSON = json.dumps({
+    "innovations": [
+        "Novel machine learning algorithm for pattern recognition",
+        "Advanced materials with enhanced properties", 
+        "Innovative computational approach to optimization"
+    ],
+    "readiness_level": 6,
+    "application_domains": ["AI/ML", "Healthcare", "Manufacturing"],
+    "technical_summary": "Breakthrough research with strong commercial potential"
+})
+
+_MOCK_MARKET_JSON = json.dumps({
+    "TAM": "$500B",
+    "SAM": "$50B",
+    "SOM": "$5B", 
+    "trends": [
+        "Rapid digital transformation across industries",
+        "Increased focus on AI-powered solutions",
+        "Growing demand for automation"
+    ],
+    "competitors": ["Google", "Microsoft", "Amazon", "IBM", "OpenAI"]
+})
+
+_MOCK_FEASIBILITY_JSON = json.dumps({
+    "roadmap": [
+        "Complete technical validation",
+        "Develop MVP prototype", 
+        "Conduct market validation",
+        "Refine product based on feedback",
+        "Scale manufacturing",
+        "Launch commercial product"
+    ],
+    "resources": {
+        "time": "18 months",
+        "team_size": "8 people", 
+        "budget": "$1.5M"
+    },
+    "risks": [
+        "Technical complexity challenges",
+        "Market competition",
+        "Regulatory requirements",
+        "Funding constraints",
+        "Talent acquisition"
+    ],
+    "feasibility_score": 7
+})
+
+_MOCK_BUSINESS_PLAN_JSON = json.dumps({
+    "slides": [
+        {
+            "title": "Problem & Opportunity",
+            "content": "Addressing critical challenges in target market with innovative solutions."
+        },
+        {
+            "title": "Core Innovation",
+            "content": "Breakthrough technology with clear competitive advantages."
+        },
+        {
+            "title": "Market Landscape", 
+            "content": "Large addressable market with strong growth potential."
+        },
+        {
+            "title": "Competitive Advantage",
+            "content": "Unique positioning with sustainable competitive moats."
+        },
+        {
+            "title": "Feasibility & Roadmap",
+            "content": "Clear development path with realistic resource requirements."
+        },
+        {
+            "title": "Business Potential",
+            "content": "Strong revenue potential with clear monetization strategy."
+        },
+        {
+            "title": "Next Steps & Investor Recommendations",
+            "content": "Ready for funding with identified investor matches."
+        }
+    ]
+})
 
 def generate_mock_response(prompt: str) -> str:
     """Generate intelligent mock responses based on prompt content."""
     prompt_lower = prompt.lower()
     
     if "innovations" in prompt_lower and "research" in prompt_lower:
-        return json.dumps({
-            "innovations": [
-                "Novel machine learning algorithm for pattern recognition",
-                "Advanced materials with enhanced properties", 
-                "Innovative computational approach to optimization"
-            ],
-            "readiness_level": 6,
-            "application_domains": ["AI/ML", "Healthcare", "Manufacturing"],
-            "technical_summary": "Breakthrough research with strong commercial potential"
-        })
+        return _MOCK_RESEARCH_JSON
     
     elif "market" in prompt_lower and "tam" in prompt_lower:
-        return json.dumps({
-            "TAM": "$500B",
-            "SAM": "$50B",
-            "SOM": "$5B", 
-            "trends": [
-                "Rapid digital transformation across industries",
-                "Increased focus on AI-powered solutions",
-                "Growing demand for automation"
-            ],
-            "competitors": ["Google", "Microsoft", "Amazon", "IBM", "OpenAI"]
-        })
+        return _MOCK_MARKET_JSON
     
     elif "feasibility" in prompt_lower and "roadmap" in prompt_lower:
-        return json.dumps({
-            "roadmap": [
-                "Complete technical validation",
-                "Develop MVP prototype", 
-                "Conduct market validation",
-                "Refine product based on feedback",
-                "Scale manufacturing",
-                "Launch commercial product"
-            ],
-            "resources": {
-                "time": "18 months",
-                "team_size": "8 people", 
-                "budget": "$1.5M"
-            },
-            "risks": [
-                "Technical complexity challenges",
-                "Market competition",
-                "Regulatory requirements",
-                "Funding constraints",
-                "Talent acquisition"
-            ],
-            "feasibility_score": 7
-        })
+        return _MOCK_FEASIBILITY_JSON
     
     elif "business plan" in prompt_lower and "slides" in prompt_lower:
-        return json.dumps({
-            "slides": [
-                {
-                    "title": "Problem & Opportunity",
-                    "content": "Addressing critical challenges in target market with innovative solutions."
-                },
-                {
-                    "title": "Core Innovation",
-                    "content": "Breakthrough technology with clear competitive advantages."
-                },
-                {
-                    "title": "Market Landscape", 
-                    "content": "Large addressable market with strong growth potential."
-                },
-                {
-                    "title": "Competitive Advantage",
-                    "content": "Unique positioning with sustainable competitive moats."
-                },
-                {
-                    "title": "Feasibility & Roadmap",
-                    "content": "Clear development path with realistic resource requirements."
-                },
-                {
-                    "title": "Business Potential",
-                    "content": "Strong revenue potential with clear monetization strategy."
-                },
-                {
-                    "title": "Next Steps & Investor Recommendations",
-                    "content": "Ready for funding with identified investor matches."
-                }
-            ]
-        })
+        return _MOCK_BUSINESS_PLAN_JSON
     
     else:
         return f"Mock Gemini response for: {prompt[:100]}..."
 
-def analyze_research_with_gemini(text: str) -> Dict[str, Any]:
+_JSON_DECODER = json.JSONDecoder()
+
+def _extract_json(text: str) -> Dict[str, Any]:
     """
-    Use Gemini to analyze research paper and extract key information.
+    Parse the JSON object at the start of a model response.
+    
+    Handles ```json fenced blocks, bare JSON and JSON preceded by prose.
+    Decoding starts only at the top-level object (the fenced block, or the
+    first '{' otherwise), so a response cut off mid-object is rejected
+    rather than yielding one of its nested objects.
     
     Args:
-        text: Research paper text content
+        text: Raw model response
     
     Returns:
-        Dictionary containing analysis results
+        The decoded JSON object
+    
+    Raises:
+        ValueError: If the response does not hold a complete JSON object
     """
-    prompt = f"""
+    fence = text.find("```json")
+    if fence != -1:
+        body_start = fence + 7
+        start = text.find('{', body_start)
+        if start == -1 or text[body_start:start].strip():
+            raise ValueError("Fenced JSON block does not hold an object")
+    else:
+        if text.lstrip().startswith('['):
+            raise ValueError("Response JSON is not an object")
+        start = text.find('{')
+        if start == -1:
+            raise ValueError("No JSON object found in response")
+    
+    try:
+        result, _ = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Incomplete JSON object in response: {e}") from e
+    
+    if not isinstance(result, dict):
+        raise ValueError("Response JSON is not an object")
+    return result
+
+# Prompt templates; only the placeholders change between calls
+_RESEARCH_PROMPT = """
     Analyze this research paper and extract the following information in JSON format:
     
-    {text[:2000]}...
+    {text}...
     
     Please provide:
     1. Key innovations (list of 3-5 main innovations)
@@ -198,22 +319,76 @@ def analyze_research_with_gemini(text: str) -> Dict[str, Any]:
     
     Return as JSON with keys: innovations, readiness_level, application_domains, technical_summary
     """
+
+_MARKET_PROMPT = """
+    Analyze the market potential for these innovations: {innovations}
+    in these domains: {domains}
+    
+    Provide market analysis in JSON format with:
+    1. Total Addressable Market (TAM) - estimated market size
+    2. Serviceable Addressable Market (SAM) - realistic target market
+    3. Serviceable Obtainable Market (SOM) - achievable market share
+    4. Key market trends (list of 3-5 trends)
+    5. Major competitors (list of 3-5 competitors)
+    
+    Return as JSON with keys: TAM, SAM, SOM, trends, competitors
+    """
+
+_FEASIBILITY_PROMPT = """
+    Assess the commercial feasibility for this technology:
+    
+    Innovations: {innovations}
+    TRL Level: {readiness_level}
+    Domains: {domains}
+    Market Size: {tam}
+    
+    Provide feasibility analysis in JSON format with:
+    1. Development roadmap (list of 5-7 key milestones)
+    2. Resource requirements (time, team size, budget)
+    3. Key risks (list of 5-7 risks)
+    4. Feasibility score (1-10)
+    
+    Return as JSON with keys: roadmap, resources, risks, feasibility_score
+    """
+
+_BUSINESS_PLAN_PROMPT = """
+    Generate a comprehensive business plan and pitch deck based on this analysis:
+    
+    Research: {research}
+    Market: {market}
+    Feasibility: {feasibility}
+    Stakeholders: {stakeholders}
+    
+    Create a pitch deck with 7 slides in JSON format:
+    1. Problem & Opportunity
+    2. Core Innovation
+    3. Market Landscape
+    4. Competitive Advantage
+    5. Feasibility & Roadmap
+    6. Business Potential
+    7. Next Steps & Investor Recommendations
+    
+    Return as JSON with key "slides" containing array of slide objects with "title" and "content" fields.
+    """
+
+def analyze_research_with_gemini(text: str) -> Dict[str, Any]:
+    """
+    Use Gemini to analyze research paper and extract key information.
+    
+    Args:
+        text: Research paper text content
+    
+    Returns:
+        Dictionary containing analysis results
+    """
+    prompt = _RESEARCH_PROMPT.format(text=text[:2000])
     
     response = call_gemini(prompt)
     
     # Try to parse JSON response, fallback to mock data
     try:
-        # Extract JSON from response if it's wrapped in markdown
-        if "```json" in response:
-            json_start = response.find("```json") + 7
-            json_end = response.find("```", json_start)
-            json_str = response[json_start:json_end].strip()
-        else:
-            json_str = response
-        
-        result = json.loads(json_str)
-        return result
-    except:
+        return _extract_json(response)
+    except ValueError:
         # Fallback to mock data
         return {
             "innovations": [
@@ -237,33 +412,13 @@ def analyze_market_with_gemini(innovations: List[str], domains: List[str]) -> Di
     Returns:
         Dictionary containing market analysis
     """
-    prompt = f"""
-    Analyze the market potential for these innovations: {', '.join(innovations)}
-    in these domains: {', '.join(domains)}
-    
-    Provide market analysis in JSON format with:
-    1. Total Addressable Market (TAM) - estimated market size
-    2. Serviceable Addressable Market (SAM) - realistic target market
-    3. Serviceable Obtainable Market (SOM) - achievable market share
-    4. Key market trends (list of 3-5 trends)
-    5. Major competitors (list of 3-5 competitors)
-    
-    Return as JSON with keys: TAM, SAM, SOM, trends, competitors
-    """
+    prompt = _MARKET_PROMPT.format(innovations=', '.join(innovations), domains=', '.join(domains))
     
     response = call_gemini(prompt)
     
     try:
-        if "```json" in response:
-            json_start = response.find("```json") + 7
-            json_end = response.find("```", json_start)
-            json_str = response[json_start:json_end].strip()
-        else:
-            json_str = response
-        
-        result = json.loads(json_str)
-        return result
-    except:
+        return _extract_json(response)
+    except ValueError:
         # Fallback to mock data
         return {
             "TAM": "$500B",
@@ -288,36 +443,18 @@ def assess_feasibility_with_gemini(research_data: Dict[str, Any], market_data: D
     Returns:
         Dictionary containing feasibility assessment
     """
-    prompt = f"""
-    Assess the commercial feasibility for this technology:
-    
-    Innovations: {research_data.get('innovations', [])}
-    TRL Level: {research_data.get('readiness_level', 0)}
-    Domains: {research_data.get('application_domains', [])}
-    Market Size: {market_data.get('TAM', 'N/A')}
-    
-    Provide feasibility analysis in JSON format with:
-    1. Development roadmap (list of 5-7 key milestones)
-    2. Resource requirements (time, team size, budget)
-    3. Key risks (list of 5-7 risks)
-    4. Feasibility score (1-10)
-    
-    Return as JSON with keys: roadmap, resources, risks, feasibility_score
-    """
+    prompt = _FEASIBILITY_PROMPT.format(
+        innovations=research_data.get('innovations', []),
+        readiness_level=research_data.get('readiness_level', 0),
+        domains=research_data.get('application_domains', []),
+        tam=market_data.get('TAM', 'N/A')
+    )
     
     response = call_gemini(prompt)
     
     try:
-        if "```json" in response:
-            json_start = response.find("```json") + 7
-            json_end = response.find("```", json_start)
-            json_str = response[json_start:json_end].strip()
-        else:
-            json_str = response
-        
-        result = json.loads(json_str)
-        return result
-    except:
+        return _extract_json(response)
+    except ValueError:
         # Fallback to mock data
         return {
             "roadmap": [
@@ -353,39 +490,18 @@ def generate_business_plan_with_gemini(all_agent_outputs: Dict[str, Any]) -> Dic
     Returns:
         Dictionary containing business plan and pitch deck content
     """
-    prompt = f"""
-    Generate a comprehensive business plan and pitch deck based on this analysis:
-    
-    Research: {all_agent_outputs.get('research_agent', {})}
-    Market: {all_agent_outputs.get('market_agent', {})}
-    Feasibility: {all_agent_outputs.get('feasibility_agent', {})}
-    Stakeholders: {all_agent_outputs.get('stakeholder_agent', {})}
-    
-    Create a pitch deck with 7 slides in JSON format:
-    1. Problem & Opportunity
-    2. Core Innovation
-    3. Market Landscape
-    4. Competitive Advantage
-    5. Feasibility & Roadmap
-    6. Business Potential
-    7. Next Steps & Investor Recommendations
-    
-    Return as JSON with key "slides" containing array of slide objects with "title" and "content" fields.
-    """
+    prompt = _BUSINESS_PLAN_PROMPT.format(
+        research=all_agent_outputs.get('research_agent', {}),
+        market=all_agent_outputs.get('market_agent', {}),
+        feasibility=all_agent_outputs.get('feasibility_agent', {}),
+        stakeholders=all_agent_outputs.get('stakeholder_agent', {})
+    )
     
     response = call_gemini(prompt)
     
     try:
-        if "```json" in response:
-            json_start = response.find("```json") + 7
-            json_end = response.find("```", json_start)
-            json_str = response[json_start:json_end].strip()
-        else:
-            json_str = response
-        
-        result = json.loads(json_str)
-        return result
-    except:
+        return _extract_json(response)
+    except ValueError:
         # Fallback to mock data
         return {
             "slides": [
@@ -2,29 +2,65 @@
 PDF and text parsing utilities for research papers.
 """
 
-import PyPDF2
 import io
+import logging
+import os
+import re
+from dataclasses import dataclass
 from typing import Optional
 
-def extract_text_from_pdf(pdf_file) -> str:
+from config import MAX_PDF_CHARS, MAX_PDF_PAGES
+
+logger = logging.getLogger(__name__)
+
+def extract_text_from_pdf(pdf_file, max_pages: int = MAX_PDF_PAGES,
+                          max_chars: int = MAX_PDF_CHARS) -> str:
     """
     Extract text content from uploaded PDF file.
     
     Args:
-        pdf_file: Uploaded file object from Streamlit
+        pdf_file: Uploaded file object from Streamlit, raw PDF bytes, or a
+            filesystem path
+        max_pages: Stop after this many pages
+        max_chars: Stop once at least this many characters are extracted
     
     Returns:
         Extracted text content
     """
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
+        # Imported here so text-only callers don't pay for loading PyMuPDF
+        import pymupdf
         
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text() + "\n"
+        if isinstance(pdf_file, (str, os.PathLike)):
+            doc = pymupdf.open(pdf_file, filetype="pdf")
+        else:
+            # Pull the whole upload into memory once; getvalue() ignores the
+            # stream position, so Streamlit reruns don't see an empty file
+            if isinstance(pdf_file, (bytes, bytearray)):
+                data = bytes(pdf_file)
+            elif hasattr(pdf_file, 'getvalue'):
+                data = pdf_file.getvalue()
+            else:
+                data = pdf_file.read()
+            doc = pymupdf.open(stream=data, filetype="pdf")
         
-        return text.strip()
+        parts = []
+        total_chars = 0
+        with doc:
+            for page in doc.pages(0, min(max_pages, doc.page_count)):
+                # A page that references no fonts (scan, full-page figure)
+                # cannot yield text, so skip interpreting its drawing ops
+                if not page.get_fonts():
+                    logger.info("Skipping PDF page %d: no fonts, no extractable text", page.number + 1)
+                    continue
+                
+                page_text = page.get_text("text")
+                parts.append(page_text)
+                total_chars += len(page_text)
+                if total_chars >= max_chars:
+                    break
+        
+        return "\n".join(parts).strip()
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
@@ -38,81 +74,61 @@ def clean_text(text: str) -> str:
     Returns:
         Cleaned text
     """
-    # Remove excessive whitespace
-    lines = text.split('\n')
-    cleaned_lines = []
-    
-    for line in lines:
-        cleaned_line = ' '.join(line.split())
-        if cleaned_line and len(cleaned_line) > 10:  # Filter out very short lines
-            cleaned_lines.append(cleaned_line)
+    # Remove excessive whitespace, streaming lines straight into the join
+    cleaned_lines = (' '.join(line.split()) for line in text.split('\n'))
     
-    return '\n'.join(cleaned_lines)
+    # Filter out very short lines
+    return '\n'.join(line for line in cleaned_lines if len(line) > 10)
 
-def extract_key_sections(text: str) -> dict:
+# Section name, keywords in priority order, and how many characters to keep
+_SECTION_KEYWORDS = (
+    ('abstract', ('abstract', 'summary'), 500),
+    ('introduction', ('introduction', 'background', 'overview'), 800),
+    ('methodology', ('methodology', 'methods', 'approach', 'experimental'), 1000),
+    ('results', ('results', 'findings', 'outcomes'), 1000),
+    ('conclusion', ('conclusion', 'discussion', 'summary'), 500),
+)
+
+@dataclass(slots=True)
+class Sections:
+    """Key sections of a research paper; empty when no keyword matched."""
+    abstract: str = ''
+    introduction: str = ''
+    methodology: str = ''
+    results: str = ''
+    conclusion: str = ''
+    full_text: Optional[str] = None
+
+def extract_key_sections(text: str, include_full_text: bool = False) -> Sections:
     """
     Extract key sections from research paper text.
     
     Args:
         text: Full text content
+        include_full_text: Also keep a reference to the whole text
     
     Returns:
-        Dictionary with extracted sections
+        Sections with the extracted snippets
     """
-    sections = {
-        'abstract': '',
-        'introduction': '',
-        'methodology': '',
-        'results': '',
-        'conclusion': '',
-        'full_text': text
-    }
+    found = {}
     
     # Simple keyword-based section extraction
     text_lower = text.lower()
     
-    # Find abstract
-    abstract_keywords = ['abstract', 'summary']
-    for keyword in abstract_keywords:
-        if keyword in text_lower:
-            start_idx = text_lower.find(keyword)
-            # Extract next 500 characters as abstract
-            sections['abstract'] = text[start_idx:start_idx + 500]
-            break
-    
-    # Find introduction
-    intro_keywords = ['introduction', 'background', 'overview']
-    for keyword in intro_keywords:
-        if keyword in text_lower:
-            start_idx = text_lower.find(keyword)
-            sections['introduction'] = text[start_idx:start_idx + 800]
-            break
-    
-    # Find methodology
-    method_keywords = ['methodology', 'methods', 'approach', 'experimental']
-    for keyword in method_keywords:
-        if keyword in text_lower:
-            start_idx = text_lower.find(keyword)
-            sections['methodology'] = text[start_idx:start_idx + 1000]
-            break
-    
-    # Find results
-    results_keywords = ['results', 'findings', 'outcomes']
-    for keyword in results_keywords:
-        if keyword in text_lower:
-            start_idx = text_lower.find(keyword)
-            sections['results'] = text[start_idx:start_idx + 1000]
-            break
-    
-    # Find conclusion
-    conclusion_keywords = ['conclusion', 'discussion', 'summary']
-    for keyword in conclusion_keywords:
-        if keyword in text_lower:
-            start_idx = text_lower.find(keyword)
-            sections['conclusion'] = text[start_idx:start_idx + 500]
-            break
-    
-    return sections
+    # Each keyword is scanned for at most once, even when shared by sections
+    positions = {}
+    for name, keywords, length in _SECTION_KEYWORDS:
+        for keyword in keywords:
+            if keyword not in positions:
+                positions[keyword] = text_lower.find(keyword)
+            start_idx = positions[keyword]
+            if start_idx != -1:
+                found[name] = text[start_idx:start_idx + length]
+                break
+    
+    return Sections(**found, full_text=text if include_full_text else None)
+
+_WORD_RE = re.compile(r'\S+')
 
 def validate_text_input(text: str) -> bool:
     """
@@ -124,12 +140,18 @@ def validate_text_input(text: str) -> bool:
     Returns:
         True if text is valid, False otherwise
     """
-    if not text or len(text.strip()) < 100:
-        return False
-    
-    # Check for minimum word count
-    word_count = len(text.split())
-    if word_count < 50:
+    if not text:
         return False
     
-    return True
+    # Need at least 50 words spanning 100+ characters once stripped; scan
+    # word by word and stop as soon as both hold
+    first_start = None
+    word_count = 0
+    for match in _WORD_RE.finditer(text):
+        if first_start is None:
+            first_start = match.start()
+        word_count += 1
+        if word_count >= 50 and match.end() - first_start >= 100:
+            return True
+    
+    return False
@@ -3,7 +3,26 @@ Verify Gemini API Key Setup
 """
 
 import os
-import google.generativeai as genai
+from typing import TYPE_CHECKING
+
+# Only needed once a key is found, so the no-key path skips the slow import
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+# Configured client and the API key it was built for, reused by later
+# checks until the key changes
+_MODEL = None
+_MODEL_API_KEY = None
+
+def _get_model(api_key: str) -> 'genai.GenerativeModel':
+    """Configure the Gemini SDK and build the test model once per API key."""
+    global _MODEL, _MODEL_API_KEY
+    if _MODEL is None or api_key != _MODEL_API_KEY:
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        _MODEL = genai.GenerativeModel('gemini-1.5-flash')
+        _MODEL_API_KEY = api_key
+    return _MODEL
 
 def verify_gemini_setup():
     """Verify that Gemini API key is properly configured."""
@@ -27,8 +46,7 @@ def verify_gemini_setup():
     
     # Test API connection
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        model = _get_model(api_key)
         
         print("🔄 Testing API connection...")
         response = model.generate_content("Hello, this is a test. Please respond with 'API working'.")